@@ -3,95 +3,259 @@ Crawler service that handles news crawling operations.
 """
 
 import asyncio
+import functools
+import io
+import itertools
+import multiprocessing
+import os
 import re
 import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set
+from email.utils import parsedate_to_datetime
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
 from urllib.parse import urlparse
 
-import dateparser
 import feedparser
 import httpx
 import trafilatura
-from bs4 import BeautifulSoup
+from dateutil import parser as date_parser
+from dateutil.tz import gettz
+import lxml.html
+from lxml import etree
+from pybloom_live import ScalableBloomFilter
 from readability import Document
 from tqdm import tqdm
 from loguru import logger
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from database import CrawlTask, Article, RSSSource
+try:
+    from resiliparse.extract.html2text import extract_plain_text
+    RESILIPARSE_AVAILABLE = True
+except ImportError:
+    RESILIPARSE_AVAILABLE = False
+    logger.warning("Resiliparse not available. Using trafilatura for extraction.")
+
+from database import SessionLocal, CrawlTask, Article, RSSSource
+
+# Timezone abbreviations commonly found in RSS dates, resolved once at import
+US_TZINFOS = {
+    "EST": gettz("US/Eastern"),
+    "EDT": gettz("US/Eastern"),
+    "CST": gettz("US/Central"),
+    "CDT": gettz("US/Central"),
+    "MST": gettz("US/Mountain"),
+    "MDT": gettz("US/Mountain"),
+    "PST": gettz("US/Pacific"),
+    "PDT": gettz("US/Pacific"),
+}
+
+# Map common domains to readable names
+_SOURCE_MAP = MappingProxyType({
+    'www.bing.com': 'Bing News',
+    'news.google.com': 'Google News',
+    'feeds.a.dj.com': 'Wall Street Journal',
+    'www.reuters.com': 'Reuters',
+    'www.nasdaq.com': 'Nasdaq'
+})
+
+# Patterns used on every RSS entry and article body
+_WS_RE = re.compile(r'\s+')
+_NOISE_RE = re.compile(r'Advertisement|Subscribe|Newsletter', re.IGNORECASE)
+_WORD_RE = re.compile(r'\b\w+\b')
+# A terminator only ends a sentence before whitespace, so "3.5%" stays whole;
+# matching terminators alone keeps the scan linear on text without any
+_SENTENCE_END_RE = re.compile(r'[.!?](?=\s|$)')
+
+
+@functools.lru_cache(maxsize=256)
+def _domain_from_feed_url(feed_url: str) -> str:
+    """Lowercased domain of a feed URL, parsed once per distinct URL."""
+    return urlparse(feed_url).netloc.lower()
+
+
+def clean_text(text: str) -> str:
+    """Clean and normalize text."""
+    if not text:
+        return ""
+
+    # Remove extra whitespace
+    text = _WS_RE.sub(' ', text)
+
+    # Remove common noise
+    text = _NOISE_RE.sub('', text)
+
+    return text.strip()
+
+
+def count_query_matches(text: str, query_words: FrozenSet[str]) -> int:
+    """Count distinct query words in text with a single tokenizer pass."""
+    hits = set()
+    for match in _WORD_RE.finditer(text.lower()):
+        word = match.group()
+        if word in query_words:
+            hits.add(word)
+            if len(hits) == len(query_words):
+                break
+    return len(hits)
+
+
+def field_tokens(article: Dict, field: str) -> FrozenSet[str]:
+    """Lowercased word set of an article field, computed once and cached on the dict."""
+    key = f'_{field}_tokens'
+    tokens = article.get(key)
+    if tokens is None:
+        tokens = frozenset(_WORD_RE.findall((article.get(field) or '').lower()))
+        article[key] = tokens
+    return tokens
+
+
+def resiliparse_extract(html: str) -> str:
+    """Extract main content with resiliparse."""
+    return extract_plain_text(html, main_content=True, preserve_formatting=False)
+
+
+def trafilatura_extract(html: str) -> str:
+    """Extract main content with trafilatura."""
+    # Our own chain already falls back to readability, so skip trafilatura's
+    content = trafilatura.extract(
+        html,
+        deduplicate=True,
+        max_tree_size=30000,
+        favor_precision=True,
+        include_comments=False,
+        include_tables=False,
+        no_fallback=True
+    )
+    return content or ""
+
+
+def readability_extract(html: str) -> str:
+    """Extract main content with readability."""
+    content = Document(html).summary()
+    if not content:
+        return ""
+    return lxml.html.fromstring(content).text_content()
+
+
+# Tried in order until one returns non-empty text
+EXTRACTORS = [trafilatura_extract, readability_extract]
+if RESILIPARSE_AVAILABLE:
+    EXTRACTORS.insert(0, resiliparse_extract)
+
+
+def _extract_content(html: str, article_url: str = "") -> str:
+    """Run the extractor chain; module-level so it can run in a worker process."""
+    for extractor in EXTRACTORS:
+        try:
+            content = extractor(html)
+        except Exception as e:
+            logger.warning(f"{extractor.__name__} failed for {article_url}: {e}")
+            continue
+
+        if content:
+            return clean_text(content)
+
+    return ""
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the HTTP/2 client with a connection pool sized for concurrent fetches."""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=50,
+            keepalive_expiry=30.0
+        ),
+        headers={
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+        }
+    )
+
+
+def create_extractor_pool() -> ProcessPoolExecutor:
+    """Create the extraction process pool without forking the threaded server process."""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=context)
 
 
 class ArticlePipeline:
     """Handles article processing pipeline."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, client: Optional[httpx.AsyncClient] = None,
+                 executor: Optional[Executor] = None,
+                 replace_executor: Optional[Callable[[Executor], Executor]] = None):
         self.db = db
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-        )
-        self.request_delay = 1.0
-        self.last_request_time = 0
+        # Extraction runs here; None falls back to the loop's default thread pool
+        self.executor = executor
+        # Called with a broken process pool to get a working replacement
+        self.replace_executor = replace_executor
+        # Reuse the caller's client so pooled connections outlive a single task
+        self._owns_client = client is None
+        self.client = client or create_http_client()
+        # Bound the number of in-flight article fetches
+        self.max_concurrency = 16
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Per-host politeness: at most 2 requests/sec to any one origin
+        self.host_delay = 0.5
+        self.host_locks: Dict[str, asyncio.Lock] = {}
+        self.host_last_request: Dict[str, float] = {}
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        if self._owns_client:
+            await self.client.aclose()
 
-    async def rate_limit(self):
-        """Implement rate limiting between requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    async def throttle(self, url: str):
+        """Space out requests to the same host; different hosts run in parallel."""
+        host = urlparse(url).netloc
+        lock = self.host_locks.setdefault(host, asyncio.Lock())
 
-        if time_since_last < self.request_delay:
-            await asyncio.sleep(self.request_delay - time_since_last)
-
-        self.last_request_time = time.time()
+        async with lock:
+            elapsed = time.monotonic() - self.host_last_request.get(host, 0.0)
+            if elapsed < self.host_delay:
+                await asyncio.sleep(self.host_delay - elapsed)
+            self.host_last_request[host] = time.monotonic()
 
     async def fetch_article_content(self, article_url: str) -> str:
         """Fetch and extract article content."""
         try:
-            await self.rate_limit()
-
-            logger.info(f"Fetching article content: {article_url}")
-            response = await self.client.get(article_url)
-            response.raise_for_status()
-
-            # Try trafilatura first
-            content = trafilatura.extract(response.text)
-            if content:
-                return self.clean_text(content)
-
-            # Fallback to readability
-            doc = Document(response.text)
-            content = doc.summary()
-            if content:
-                soup = BeautifulSoup(content, 'html.parser')
-                return self.clean_text(soup.get_text())
-
-            return ""
+            html = await self._fetch_html(article_url)
+
+            # Extraction is CPU-bound; keep it off the event loop
+            loop = asyncio.get_running_loop()
+            executor = self.executor
+            try:
+                return await loop.run_in_executor(executor, _extract_content, html, article_url)
+            except BrokenProcessPool:
+                # A worker died; later articles use a fresh pool, this one a thread.
+                # Hand over the pool that failed so concurrent failures replace it once
+                if self.replace_executor is not None:
+                    self.executor = self.replace_executor(executor)
+                elif self.executor is executor:
+                    self.executor = None
+                return await loop.run_in_executor(None, _extract_content, html, article_url)
 
         except Exception as e:
             logger.error(f"Error fetching article content {article_url}: {e}")
             return ""
 
-    def clean_text(self, text: str) -> str:
-        """Clean and normalize text."""
-        if not text:
-            return ""
-
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-
-        # Remove common noise
-        text = re.sub(r'Advertisement|Subscribe|Newsletter',
-                      '', text, flags=re.IGNORECASE)
-
-        return text.strip()
+    async def _fetch_html(self, article_url: str) -> str:
+        """Download an article page."""
+        await self.throttle(article_url)
+        async with self.semaphore:
+            logger.info(f"Fetching article content: {article_url}")
+            response = await self.client.get(article_url)
+            response.raise_for_status()
+            return response.text
 
     def generate_summary(self, article: Dict) -> str:
         """Generate article summary."""
@@ -104,30 +268,23 @@ class ArticlePipeline:
         if not text:
             return ""
 
-        # Simple summary: first paragraph or first few sentences
-        sentences = text.split('. ')
-        if len(sentences) >= 2:
-            return sentences[0] + '. ' + sentences[1] + '.'
-        elif len(sentences) == 1:
-            return sentences[0] + '.'
+        # Simple summary: first two sentences, without splitting the whole text
+        ends = list(itertools.islice(_SENTENCE_END_RE.finditer(text), 2))
+        if ends:
+            return text[:ends[-1].end()].strip()
 
         return text[:200] + '...' if len(text) > 200 else text
 
-    def calculate_relevance_score(self, article: Dict, query: str) -> int:
+    def calculate_relevance_score(self, article: Dict, query_words: FrozenSet[str]) -> int:
         """Calculate relevance score for an article."""
-        query_words = set(query.lower().split())
-        
         # Check title (weight: 3)
-        title_words = set(re.findall(r'\b\w+\b', article.get('title', '').lower()))
-        title_matches = len(query_words.intersection(title_words))
+        title_matches = len(query_words & field_tokens(article, 'title'))
         
         # Check summary (weight: 2)
-        summary_words = set(re.findall(r'\b\w+\b', article.get('summary', '').lower()))
-        summary_matches = len(query_words.intersection(summary_words))
+        summary_matches = len(query_words & field_tokens(article, 'summary'))
         
-        # Check text content (weight: 1)
-        text_words = set(re.findall(r'\b\w+\b', article.get('text', '').lower()))
-        text_matches = len(query_words.intersection(text_words))
+        # Check text content (weight: 1), scanned once so no token set is kept
+        text_matches = count_query_matches(article.get('text', ''), query_words)
         
         # Calculate weighted score (0-100)
         total_matches = title_matches * 3 + summary_matches * 2 + text_matches
@@ -145,11 +302,45 @@ class CrawlerService:
     
     def __init__(self, db: Session):
         self.db = db
-        self.seen_urls: Set[str] = set()
-
-    def get_rss_sources(self, supports_query: bool = None) -> List[RSSSource]:
+        # URLs seen while collecting each running task's feeds, keyed by task id
+        self.seen_urls: Dict[int, Set[str]] = {}
+        # URLs already stored by earlier tasks; the unique index stays as backstop
+        self.url_bloom = ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
+        self.load_stored_urls()
+        # At most 10 feeds in flight so large source lists don't trigger resets
+        self.feed_semaphore = asyncio.Semaphore(10)
+        # Articles are inserted in batches and progress committed in between
+        self.write_batch_size = 50
+        self.progress_every = 10
+        # Last body per feed URL, replayed when the server answers 304
+        self.feed_cache: Dict[str, bytes] = {}
+        # Shared across tasks so TCP/TLS/HTTP2 sessions persist between crawls
+        self.client = create_http_client()
+        # HTML extraction holds the GIL, so spread it across processes
+        self.extractor_pool = create_extractor_pool()
+
+    async def close(self):
+        """Close the shared HTTP client and extractor pool."""
+        await self.client.aclose()
+        self.extractor_pool.shutdown(wait=False, cancel_futures=True)
+
+    def replace_extractor_pool(self, broken: Executor) -> Executor:
+        """Swap in a new extractor pool once a worker process has died."""
+        if broken is self.extractor_pool:
+            logger.warning("Extractor process pool is broken; starting a new one")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.extractor_pool = create_extractor_pool()
+        return self.extractor_pool
+
+    def load_stored_urls(self):
+        """Populate the URL Bloom filter from articles already in the database."""
+        for (url,) in self.db.query(Article.url).yield_per(1000):
+            self.url_bloom.add(url)
+
+    def get_rss_sources(self, supports_query: bool = None,
+                        db: Optional[Session] = None) -> List[RSSSource]:
         """Get RSS sources from database."""
-        query = self.db.query(RSSSource).filter(RSSSource.is_active == True)
+        query = (db or self.db).query(RSSSource).filter(RSSSource.is_active == True)
         
         if supports_query is not None:
             query = query.filter(RSSSource.supports_query == supports_query)
@@ -170,26 +361,31 @@ class CrawlerService:
         # Prioritize query-specific feeds
         return query_feeds + general_feeds
 
-    async def fetch_rss_feed(self, feed_url: str, task: CrawlTask, pipeline: ArticlePipeline) -> List[Dict]:
+    async def fetch_rss_feed(self, feed_url: str, task: CrawlTask, pipeline: ArticlePipeline,
+                             source: Optional[RSSSource] = None) -> List[Dict]:
         """Fetch and parse RSS feed."""
         try:
-            logger.info(f"Fetching RSS feed: {feed_url}")
-            response = await pipeline.client.get(feed_url)
-            response.raise_for_status()
+            async with self.feed_semaphore:
+                logger.info(f"Fetching RSS feed: {feed_url}")
+                content = await self.fetch_feed_body(feed_url, pipeline, source)
 
-            feed = feedparser.parse(response.text)
+            articles = []
+            try:
+                parsed = self.collect_articles(
+                    self.iter_rss_items(content), feed_url, task, articles)
+            except etree.XMLSyntaxError as e:
+                logger.warning(f"RSS stream parsing issues for {feed_url}: {e}")
+                parsed = 0
 
-            if feed.bozo:
-                logger.warning(f"RSS feed parsing issues for {feed_url}: {feed.bozo_exception}")
+            # Fall back to feedparser for Atom/RDF feeds, malformed XML or items
+            # whose links the streaming parser could not find
+            if not parsed:
+                feed = feedparser.parse(content)
 
-            articles = []
-            for entry in feed.entries:
-                if task.processed_articles >= task.limit:
-                    break
+                if feed.bozo:
+                    logger.warning(f"RSS feed parsing issues for {feed_url}: {feed.bozo_exception}")
 
-                article = self.parse_rss_entry(entry, feed_url, task)
-                if article and self.is_relevant(article, task.query):
-                    articles.append(article)
+                self.collect_articles(feed.entries, feed_url, task, articles)
 
             return articles
 
@@ -197,6 +393,87 @@ class CrawlerService:
             logger.error(f"Error fetching RSS feed {feed_url}: {e}")
             return []
 
+    async def fetch_feed_body(self, feed_url: str, pipeline: ArticlePipeline,
+                              source: Optional[RSSSource] = None) -> bytes:
+        """Download a feed body, using ETag/Last-Modified for static sources."""
+        headers = {}
+        cached = self.feed_cache.get(feed_url)
+        if source is not None and cached is not None:
+            if source.etag:
+                headers['If-None-Match'] = source.etag
+            if source.last_modified:
+                headers['If-Modified-Since'] = source.last_modified
+
+        await pipeline.throttle(feed_url)
+        response = await pipeline.client.get(feed_url, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            logger.info(f"RSS feed not modified: {feed_url}")
+            return cached
+        response.raise_for_status()
+
+        if source is not None:
+            source.etag = response.headers.get('ETag')
+            source.last_modified = response.headers.get('Last-Modified')
+            self.feed_cache[feed_url] = response.content
+
+        return response.content
+
+    def iter_rss_items(self, content: bytes) -> Iterator[feedparser.FeedParserDict]:
+        """Stream RSS <item> elements as feedparser-style entries."""
+        context = etree.iterparse(
+            io.BytesIO(content), events=('end',), tag='item', resolve_entities=False)
+
+        for _, element in context:
+            categories = [c.text.strip() for c in element.iterfind('category') if c.text]
+            link = (element.findtext('link') or '').strip()
+            if not link:
+                # Like feedparser, treat a permalink guid as the item link
+                guid = element.find('guid')
+                if guid is not None and guid.text and guid.get('isPermaLink') != 'false':
+                    link = guid.text.strip()
+            entry = feedparser.FeedParserDict(
+                title=element.findtext('title') or '',
+                link=link,
+                summary=element.findtext('description') or '',
+                tags=[feedparser.FeedParserDict(term=c) for c in categories]
+            )
+
+            published = element.findtext('pubDate')
+            if published:
+                entry['published'] = published
+            if categories:
+                entry['category'] = categories[0]
+
+            source = element.find('source')
+            if source is not None and source.text:
+                entry['source'] = feedparser.FeedParserDict(
+                    title=source.text.strip(), href=source.get('url', ''))
+
+            yield entry
+
+            # Release the processed item so memory stays flat on large feeds
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    def collect_articles(self, entries: Iterable, feed_url: str, task: CrawlTask,
+                         articles: List[Dict]) -> int:
+        """Append relevant entries to articles until the task limit; return entries with a link."""
+        query_words = frozenset(task.query.lower().split())
+
+        count = 0
+        for entry in entries:
+            if len(articles) >= task.limit:
+                break
+            if getattr(entry, 'link', ''):
+                count += 1
+
+            article = self.parse_rss_entry(entry, feed_url, task)
+            if article and self.is_relevant(article, query_words):
+                articles.append(article)
+
+        return count
+
     def parse_rss_entry(self, entry, feed_url: str, task: CrawlTask) -> Optional[Dict]:
         """Parse RSS entry into standardized article format."""
         try:
@@ -208,10 +485,11 @@ class CrawlerService:
             if not title or not url:
                 return None
 
-            # Skip if already seen
-            if url in self.seen_urls:
+            # Skip if already stored by a previous task or seen in this one
+            seen_urls = self.seen_urls.setdefault(task.id, set())
+            if url in self.url_bloom or url in seen_urls:
                 return None
-            self.seen_urls.add(url)
+            seen_urls.add(url)
 
             # Parse published date
             published = None
@@ -221,6 +499,9 @@ class CrawlerService:
             elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
                 published = datetime(
                     *entry.updated_parsed[:6], tzinfo=timezone.utc)
+            else:
+                published = self.parse_raw_date(
+                    entry.get('published') or entry.get('updated'))
 
             # Filter by date if specified
             if task.since and published:
@@ -233,13 +514,14 @@ class CrawlerService:
 
             # Clean summary
             if summary:
-                summary = self.clean_text(summary)
+                summary = clean_text(summary)
 
             return {
                 'title': title,
                 'source': source,
                 'url': url,
                 'published': published.isoformat() if published else None,
+                '_published_dt': published,  # Avoids re-parsing the ISO string on insert
                 'summary': summary,
                 'text': '',  # Will be filled later
                 'tags': self.extract_tags(entry)
@@ -249,26 +531,33 @@ class CrawlerService:
             logger.error(f"Error parsing RSS entry: {e}")
             return None
 
+    def parse_raw_date(self, raw: Optional[str]) -> Optional[datetime]:
+        """Parse a raw RSS date string into an aware UTC datetime."""
+        if not raw:
+            return None
+
+        try:
+            # RSS pubDate is RFC 822; the stdlib parser handles it cheaply
+            published = parsedate_to_datetime(raw)
+        except (TypeError, ValueError):
+            try:
+                published = date_parser.parse(raw, tzinfos=US_TZINFOS)
+            except (ValueError, OverflowError):
+                return None
+
+        if published.tzinfo is None:
+            return published.replace(tzinfo=timezone.utc)
+        return published.astimezone(timezone.utc)
+
     def extract_source(self, feed_url: str, entry) -> str:
         """Extract source name from feed URL or entry."""
         # Try to get source from entry first
         if hasattr(entry, 'source') and hasattr(entry.source, 'title'):
             return entry.source.title
 
-        # Extract from feed URL
-        parsed = urlparse(feed_url)
-        domain = parsed.netloc.lower()
-
         # Map common domains to readable names
-        source_map = {
-            'www.bing.com': 'Bing News',
-            'news.google.com': 'Google News',
-            'feeds.a.dj.com': 'Wall Street Journal',
-            'www.reuters.com': 'Reuters',
-            'www.nasdaq.com': 'Nasdaq'
-        }
-
-        return source_map.get(domain, domain)
+        domain = _domain_from_feed_url(feed_url)
+        return _SOURCE_MAP.get(domain, domain)
 
     def extract_tags(self, entry) -> List[str]:
         """Extract tags from RSS entry."""
@@ -284,62 +573,61 @@ class CrawlerService:
 
         return tags
 
-    def is_relevant(self, article: Dict, query: str) -> bool:
+    def is_relevant(self, article: Dict, query_words: FrozenSet[str]) -> bool:
         """Check if article is relevant to the query."""
-        query_words = set(query.lower().split())
-
-        # Check title and summary
-        text_to_check = f"{article['title']} {article['summary']}".lower()
-        text_words = set(re.findall(r'\b\w+\b', text_to_check))
-
-        # Simple relevance check - at least one query word should be present
-        return bool(query_words.intersection(text_words))
-
-    def clean_text(self, text: str) -> str:
-        """Clean and normalize text."""
-        if not text:
-            return ""
-
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-
-        # Remove common noise
-        text = re.sub(r'Advertisement|Subscribe|Newsletter',
-                      '', text, flags=re.IGNORECASE)
-
-        return text.strip()
+        # Check title and summary; the token sets are reused for scoring
+        return not (query_words.isdisjoint(field_tokens(article, 'title'))
+                    and query_words.isdisjoint(field_tokens(article, 'summary')))
 
     async def crawl_task(self, task_id: int) -> bool:
         """Main crawling method for a specific task."""
-        task = self.db.query(CrawlTask).filter(CrawlTask.id == task_id).first()
+        # Each crawl gets its own session so concurrent crawls cannot roll back
+        # or expire each other's pending changes
+        db = SessionLocal()
+        try:
+            return await self._crawl_task(db, task_id)
+        finally:
+            db.close()
+
+    async def _crawl_task(self, db: Session, task_id: int) -> bool:
+        """Run one crawl task using the given session."""
+        task = db.query(CrawlTask).filter(CrawlTask.id == task_id).first()
         if not task:
             logger.error(f"Task {task_id} not found")
             return False
 
+        writer = None
         try:
             # Update task status
             task.status = "running"
             task.started_at = datetime.utcnow()
-            self.db.commit()
+            db.commit()
 
             # Get RSS sources
-            sources = self.get_rss_sources()
+            sources = self.get_rss_sources(db=db)
             if not sources:
                 logger.error("No RSS sources available")
                 task.status = "failed"
                 task.error_message = "No RSS sources available"
-                self.db.commit()
+                db.commit()
                 return False
 
             # Filter feeds by query support
             feed_urls = self.filter_feeds_by_query(sources, task.query)
 
+            # Static feeds have a stable URL, so they can use conditional GET
+            static_sources = {source.url_template: source for source in sources if not source.supports_query}
+
             logger.info(f"Starting crawl for task {task_id} with {len(feed_urls)} feeds, limit: {task.limit}")
 
             # Initialize article pipeline
-            async with ArticlePipeline(self.db) as pipeline:
+            async with ArticlePipeline(db, self.client, self.extractor_pool,
+                                       self.replace_extractor_pool) as pipeline:
                 # Fetch RSS feeds concurrently
-                tasks_list = [self.fetch_rss_feed(feed_url, task, pipeline) for feed_url in feed_urls]
+                tasks_list = [
+                    self.fetch_rss_feed(feed_url, task, pipeline, static_sources.get(feed_url))
+                    for feed_url in feed_urls
+                ]
                 results = await asyncio.gather(*tasks_list, return_exceptions=True)
 
                 # Collect articles
@@ -355,52 +643,115 @@ class CrawlerService:
                 # Process articles
                 if articles:
                     task.total_articles = len(articles)
-                    self.db.commit()
+                    db.commit()
 
                     logger.info("Processing articles...")
-                    for i, article in enumerate(articles):
-                        if task.processed_articles >= task.limit:
-                            break
+                    articles = articles[:task.limit]
+
+                    total = len(articles)
+                    query_words = frozenset(task.query.lower().split())
+
+                    # Rows flow through a queue to a single DB writer
+                    queue: asyncio.Queue = asyncio.Queue()
+                    writer = asyncio.create_task(self.write_articles(db, queue, task, total))
 
-                        # Fetch article content
+                    async def process(article: Dict):
                         content = await pipeline.fetch_article_content(article['url'])
                         article['text'] = content
-                        article['summary'] = pipeline.generate_summary(article)
-                        article['relevance_score'] = pipeline.calculate_relevance_score(article, task.query)
-
-                        # Save article to database
-                        db_article = Article(
-                            task_id=task.id,
-                            title=article['title'],
-                            source=article['source'],
-                            url=article['url'],
-                            published=datetime.fromisoformat(article['published'].replace('Z', '+00:00')) if article['published'] else None,
-                            summary=article['summary'],
-                            text=article['text'],
-                            tags=article['tags'],
-                            relevance_score=article['relevance_score']
-                        )
-                        self.db.add(db_article)
-
-                        task.processed_articles += 1
-                        task.progress = int((task.processed_articles / min(task.total_articles, task.limit)) * 100)
-                        self.db.commit()
-
-                        # Update progress
-                        logger.info(f"Processed {task.processed_articles}/{min(task.total_articles, task.limit)} articles")
+                        summary = pipeline.generate_summary(article)
+                        if summary != article['summary']:
+                            article['summary'] = summary
+                            article.pop('_summary_tokens', None)
+                        article['relevance_score'] = pipeline.calculate_relevance_score(article, query_words)
+
+                        await queue.put({
+                            'task_id': task.id,
+                            'title': article['title'],
+                            'source': article['source'],
+                            'url': article['url'],
+                            'published': article['_published_dt'],
+                            'summary': article['summary'],
+                            'text': article['text'],
+                            'tags': article['tags'],
+                            'relevance_score': article['relevance_score']
+                        })
+
+                    # Fetch article content concurrently
+                    results = await asyncio.gather(*[process(article) for article in articles], return_exceptions=True)
+                    for article, result in zip(articles, results):
+                        if isinstance(result, Exception):
+                            logger.error(f"Article processing error {article['url']}: {result}")
+
+                    await queue.put(None)
+                    await writer
+
+                    logger.info(f"Processed {task.processed_articles}/{total} articles")
 
             # Mark task as completed
             task.status = "completed"
             task.completed_at = datetime.utcnow()
             task.progress = 100
-            self.db.commit()
+            db.commit()
 
             logger.info(f"Crawling completed for task {task_id}. Processed {task.processed_articles} articles")
             return True
 
+        except asyncio.CancelledError:
+            # Shutdown cancelled the worker; don't leave the task marked running
+            logger.warning(f"Crawl task {task_id} cancelled")
+            if writer is not None:
+                writer.cancel()
+            db.rollback()
+            task.status = "failed"
+            task.error_message = "Crawl cancelled"
+            db.commit()
+            raise
+
         except Exception as e:
             logger.error(f"Error in crawl_task {task_id}: {e}")
+            db.rollback()
             task.status = "failed"
             task.error_message = str(e)
-            self.db.commit()
+            db.commit()
             return False
+
+        finally:
+            self.seen_urls.pop(task_id, None)
+
+    async def write_articles(self, db: Session, queue: asyncio.Queue, task: CrawlTask, total: int):
+        """Consume article rows from the queue and insert them in batches."""
+        batch = []
+        handled = 0
+        while True:
+            row = await queue.get()
+            if row is None:
+                break
+
+            batch.append(row)
+            handled += 1
+            task.progress = int((handled / total) * 100)
+
+            if len(batch) >= self.write_batch_size:
+                self.save_articles(db, task, batch)
+                batch = []
+            elif handled % self.progress_every == 0:
+                # Persist progress between batches
+                db.commit()
+                logger.info(f"Processed {handled}/{total} articles")
+
+        if batch:
+            self.save_articles(db, task, batch)
+
+    def save_articles(self, db: Session, task: CrawlTask, rows: List[Dict]):
+        """Insert a batch of article rows in one statement, skipping stored URLs."""
+        # Another task may have stored the same URL since the bloom check, so count
+        # only inserted rows; Core execution is used because ORM bulk inserts
+        # don't report rowcount
+        result = db.connection().execute(
+            insert(Article).prefix_with("OR IGNORE", dialect="sqlite"), rows)
+        task.processed_articles += result.rowcount
+        db.commit()
+
+        # Skipped URLs are stored too, so every row belongs in the filter
+        for row in rows:
+            self.url_bloom.add(row['url'])
@@ -4,7 +4,7 @@ Database models and configuration for the news crawler backend.
 
 from datetime import datetime, date
 from typing import Optional, List
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey
+from sqlalchemy import create_engine, event, inspect, text, Column, Index, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from pydantic import BaseModel, field_validator
@@ -12,7 +12,28 @@ from pathlib import Path
 
 # Database configuration
 DATABASE_URL = "sqlite:///./news_crawler.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False, "timeout": 30},
+    pool_size=20,
+    max_overflow=40,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+)
+
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling so commits don't fsync the whole database."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped reads
+    cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -39,6 +60,10 @@ class CrawlTask(Base):
     articles = relationship("Article", back_populates="task", cascade="all, delete-orphan")
     custom_feeds = relationship("CustomFeed", back_populates="task", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_tasks_status", "status"),
+    )
+
 
 class Article(Base):
     """Article model."""
@@ -59,6 +84,10 @@ class Article(Base):
     # Relationships
     task = relationship("CrawlTask", back_populates="articles")
 
+    __table_args__ = (
+        Index("ix_articles_task_source", "task_id", "source"),
+    )
+
 
 class CustomFeed(Base):
     """Custom RSS feed model."""
@@ -85,6 +114,8 @@ class RSSSource(Base):
     supports_query = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
     priority = Column(Integer, default=0)
+    etag = Column(String, nullable=True)  # Conditional GET validators
+    last_modified = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
@@ -193,9 +224,30 @@ class RSSSourceResponse(BaseModel):
 
 
 # Database initialization
+def migrate_database():
+    """Add columns introduced after a table was first created."""
+    added_columns = {
+        "rss_sources": {"etag": "VARCHAR", "last_modified": "VARCHAR"},
+    }
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in added_columns.items():
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for name, column_type in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}"))
+
+        # create_all skips tables that already exist, so add any new indexes here
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
 def init_database():
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
+    migrate_database()
     
     # Initialize default RSS sources
     db = SessionLocal()
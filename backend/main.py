@@ -3,20 +3,24 @@ FastAPI backend service for news crawler with WebSocket support.
 """
 
 import asyncio
-import json
-from datetime import datetime
-from typing import List, Optional
+import os
+from datetime import datetime, timezone
+from typing import List, Optional, Set
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from loguru import logger
+import anyio
+import orjson
+import ormsgpack
 import uvicorn
 
 from database import (
-    get_db, init_database, CrawlTask, Article, RSSSource, AppConfig, CustomFeed,
+    get_db, init_database, SessionLocal, CrawlTask, Article, RSSSource, AppConfig, CustomFeed,
     CrawlTaskCreate, CrawlTaskResponse, ArticleResponse, RSSSourceCreate, RSSSourceResponse
 )
 from crawler_service import CrawlerService
@@ -25,14 +29,14 @@ from summary_service import SummaryService
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
     async def send_progress_update(self, task_id: int, progress: int, status: str, message: str = ""):
         """Send progress update to all connected clients."""
@@ -42,16 +46,23 @@ class ConnectionManager:
             "progress": progress,
             "status": status,
             "message": message,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc)
         }
         
-        # Send to all connected clients
-        for connection in self.active_connections.copy():
-            try:
-                await connection.send_text(json.dumps(data))
-            except:
-                # Remove disconnected clients
-                self.active_connections.remove(connection)
+        # Serialize once for every client; the frontend expects text frames
+        payload = orjson.dumps(data, option=orjson.OPT_UTC_Z).decode()
+        
+        # Send to all connected clients concurrently
+        connections = tuple(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True
+        )
+        
+        # Remove disconnected clients
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.active_connections.discard(connection)
 
 manager = ConnectionManager()
 
@@ -59,10 +70,14 @@ manager = ConnectionManager()
 crawler_service = None
 summary_service = None
 
+# Crawl jobs are queued and drained by a fixed set of workers owned by the lifespan
+CRAWL_WORKERS = 2
+crawl_queue: Optional[asyncio.Queue] = None
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global crawler_service, summary_service
+    global crawler_service, summary_service, crawl_queue
     
     try:
         # Initialize database
@@ -79,17 +94,26 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize services: {e}")
         # Continue without services for now
     
+    crawl_queue = asyncio.Queue()
+    workers = [asyncio.create_task(crawl_worker()) for _ in range(CRAWL_WORKERS)]
+    
     yield
     
     # Cleanup
     logger.info("Shutting down services")
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    if crawler_service:
+        await crawler_service.close()
 
 # Create FastAPI app
 app = FastAPI(
     title="News Crawler API",
     description="Backend API for news crawling and management",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -101,6 +125,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class ORMsgpackResponse(Response):
+    """MessagePack response for clients that send Accept: application/x-msgpack."""
+    media_type = "application/x-msgpack"
+
+    def render(self, content) -> bytes:
+        return ormsgpack.packb(content)
+
+def to_response_rows(rows, response_model) -> List[dict]:
+    """Project ORM rows onto a response model's fields without re-validating them."""
+    fields = tuple(response_model.model_fields)
+    return [{field: getattr(row, field) for field in fields} for row in rows]
+
+VARY_ACCEPT = {"Vary": "Accept"}
+
+def list_response(request: Request, rows: List[dict]) -> Response:
+    """Encode rows as MessagePack when requested, JSON otherwise."""
+    # The encoding depends on Accept, so caches must key on it
+    if ORMsgpackResponse.media_type in request.headers.get("accept", ""):
+        return ORMsgpackResponse(rows, headers=VARY_ACCEPT)
+    return ORJSONResponse(rows, headers=VARY_ACCEPT)
+
+# Lists larger than this are streamed as JSON instead of built in memory
+STREAM_MIN_ROWS = 500
+STREAM_CHUNK_ROWS = 200
+
+def stream_rows(statement, response_model):
+    """Yield a JSON array of rows, encoding each fetched chunk as it arrives."""
+    fields = tuple(response_model.model_fields)
+    # The request's session is closed before the body is sent, so use our own
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=STREAM_CHUNK_ROWS)).scalars()
+        separator = b"["
+        for partition in result.partitions():
+            yield separator + b",".join(
+                orjson.dumps({field: getattr(row, field) for field in fields}) for row in partition
+            )
+            separator = b","
+        yield b"]" if separator == b"," else b"[]"
+    finally:
+        db.close()
+
 # Background task for crawling
 async def run_crawl_task(task_id: int):
     """Background task to run crawling."""
@@ -112,6 +178,21 @@ async def run_crawl_task(task_id: int):
         else:
             await manager.send_progress_update(task_id, 0, "failed", "Crawling failed")
 
+async def crawl_worker():
+    """Run queued crawl tasks one at a time."""
+    while True:
+        task_id = await crawl_queue.get()
+        try:
+            await run_crawl_task(task_id)
+        except Exception as e:
+            logger.error(f"Crawl worker failed on task {task_id}: {e}")
+        finally:
+            crawl_queue.task_done()
+
+def enqueue_crawl_task(task_id: int):
+    """Queue a crawl task from a threadpool endpoint."""
+    anyio.from_thread.run_sync(crawl_queue.put_nowait, task_id)
+
 # API Routes
 
 @app.get("/")
@@ -122,14 +203,15 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "healthy", "timestamp": datetime.now(timezone.utc)}
 
 # Task Management Endpoints
+# Endpoints that only touch the request's Session are plain `def` so FastAPI runs
+# them in its threadpool instead of blocking the event loop on SQLite.
 
 @app.post("/tasks", response_model=CrawlTaskResponse)
-async def create_crawl_task(
+def create_crawl_task(
     task_data: CrawlTaskCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Create a new crawl task."""
@@ -141,21 +223,19 @@ async def create_crawl_task(
             limit=task_data.limit
         )
         db.add(task)
-        db.commit()
-        db.refresh(task)
+        db.flush()
 
-        # Add custom feeds if provided
+        # Add custom feeds if provided, in the same transaction as the task
         if task_data.custom_feeds:
-            for feed_url in task_data.custom_feeds:
-                custom_feed = CustomFeed(
-                    task_id=task.id,
-                    url=feed_url
-                )
-                db.add(custom_feed)
-            db.commit()
+            db.execute(
+                insert(CustomFeed),
+                [{"task_id": task.id, "url": feed_url} for feed_url in task_data.custom_feeds]
+            )
+        db.commit()
+        db.refresh(task)
 
-        # Start background crawling task
-        background_tasks.add_task(run_crawl_task, task.id)
+        # Queue the crawl for the background workers
+        enqueue_crawl_task(task.id)
 
         logger.info(f"Created crawl task {task.id} for query: {task_data.query}")
         return task
@@ -165,7 +245,8 @@ async def create_crawl_task(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/tasks", response_model=List[CrawlTaskResponse])
-async def get_crawl_tasks(
+def get_crawl_tasks(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
@@ -178,10 +259,10 @@ async def get_crawl_tasks(
         query = query.filter(CrawlTask.status == status)
     
     tasks = query.offset(skip).limit(limit).all()
-    return tasks
+    return list_response(request, to_response_rows(tasks, CrawlTaskResponse))
 
 @app.get("/tasks/{task_id}", response_model=CrawlTaskResponse)
-async def get_crawl_task(task_id: int, db: Session = Depends(get_db)):
+def get_crawl_task(task_id: int, db: Session = Depends(get_db)):
     """Get a specific crawl task."""
     task = db.query(CrawlTask).filter(CrawlTask.id == task_id).first()
     if not task:
@@ -189,7 +270,7 @@ async def get_crawl_task(task_id: int, db: Session = Depends(get_db)):
     return task
 
 @app.delete("/tasks/{task_id}")
-async def delete_crawl_task(task_id: int, db: Session = Depends(get_db)):
+def delete_crawl_task(task_id: int, db: Session = Depends(get_db)):
     """Delete a crawl task and its articles."""
     task = db.query(CrawlTask).filter(CrawlTask.id == task_id).first()
     if not task:
@@ -202,9 +283,8 @@ async def delete_crawl_task(task_id: int, db: Session = Depends(get_db)):
     return {"message": "Task deleted successfully"}
 
 @app.post("/tasks/{task_id}/retry")
-async def retry_crawl_task(
+def retry_crawl_task(
     task_id: int,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Retry a failed crawl task."""
@@ -224,15 +304,16 @@ async def retry_crawl_task(
     task.processed_articles = 0
     db.commit()
     
-    # Start background crawling task
-    background_tasks.add_task(run_crawl_task, task.id)
+    # Queue the crawl for the background workers
+    enqueue_crawl_task(task.id)
     
     return {"message": "Task retry initiated"}
 
 # Article Management Endpoints
 
 @app.get("/articles", response_model=List[ArticleResponse])
-async def get_articles(
+def get_articles(
+    request: Request,
     task_id: Optional[int] = None,
     source: Optional[str] = None,
     skip: int = 0,
@@ -248,11 +329,16 @@ async def get_articles(
     if source:
         query = query.filter(Article.source == source)
     
-    articles = query.offset(skip).limit(limit).all()
-    return articles
+    query = query.offset(skip).limit(limit)
+    if limit > STREAM_MIN_ROWS and ORMsgpackResponse.media_type not in request.headers.get("accept", ""):
+        return StreamingResponse(stream_rows(query.statement, ArticleResponse),
+                                 media_type="application/json", headers=VARY_ACCEPT)
+
+    articles = query.all()
+    return list_response(request, to_response_rows(articles, ArticleResponse))
 
 @app.get("/articles/{article_id}", response_model=ArticleResponse)
-async def get_article(article_id: int, db: Session = Depends(get_db)):
+def get_article(article_id: int, db: Session = Depends(get_db)):
     """Get a specific article."""
     article = db.query(Article).filter(Article.id == article_id).first()
     if not article:
@@ -287,13 +373,13 @@ async def regenerate_article_summary(
 # RSS Source Management Endpoints
 
 @app.get("/rss-sources", response_model=List[RSSSourceResponse])
-async def get_rss_sources(db: Session = Depends(get_db)):
+def get_rss_sources(request: Request, db: Session = Depends(get_db)):
     """Get all RSS sources."""
     sources = db.query(RSSSource).all()
-    return sources
+    return list_response(request, to_response_rows(sources, RSSSourceResponse))
 
 @app.post("/rss-sources", response_model=RSSSourceResponse)
-async def create_rss_source(
+def create_rss_source(
     source_data: RSSSourceCreate,
     db: Session = Depends(get_db)
 ):
@@ -311,7 +397,7 @@ async def create_rss_source(
     return source
 
 @app.put("/rss-sources/{source_id}", response_model=RSSSourceResponse)
-async def update_rss_source(
+def update_rss_source(
     source_id: int,
     source_data: RSSSourceCreate,
     db: Session = Depends(get_db)
@@ -331,7 +417,7 @@ async def update_rss_source(
     return source
 
 @app.delete("/rss-sources/{source_id}")
-async def delete_rss_source(source_id: int, db: Session = Depends(get_db)):
+def delete_rss_source(source_id: int, db: Session = Depends(get_db)):
     """Delete an RSS source."""
     source = db.query(RSSSource).filter(RSSSource.id == source_id).first()
     if not source:
@@ -403,10 +489,14 @@ async def general_exception_handler(request, exc):
     )
 
 if __name__ == "__main__":
+    # Reload only in development; WEB_CONCURRENCY sets the worker count otherwise.
+    # Progress broadcasts and the crawl queue are per-process, so it defaults to 1.
+    reload = os.getenv("DEBUG", "false").lower() == "true"
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=reload,
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", "1")),
         log_level="info"
     )
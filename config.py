@@ -4,6 +4,7 @@ Configuration settings for News Crawler Desktop Application
 
 import os
 from pathlib import Path
+from types import MappingProxyType
 
 # Base paths
 BASE_DIR = Path(__file__).parent
@@ -119,43 +120,45 @@ LOG_FILE = BASE_DIR / "news_crawler.log"
 OUTPUT_DIR.mkdir(exist_ok=True)
 (BASE_DIR / "logs").mkdir(exist_ok=True)
 
+# Built once at import; every value above is fixed for the life of the process
+_CONFIG = MappingProxyType({
+    "database_url": DATABASE_URL,
+    "api_host": API_HOST,
+    "api_port": API_PORT,
+    "api_base_url": API_BASE_URL,
+    "ws_url": WS_URL,
+    "default_limit": DEFAULT_LIMIT,
+    "max_limit": MAX_LIMIT,
+    "request_delay": REQUEST_DELAY,
+    "request_timeout": REQUEST_TIMEOUT,
+    "summary_strategies": SUMMARY_STRATEGIES,
+    "default_summary_strategy": DEFAULT_SUMMARY_STRATEGY,
+    "summary_cache_duration_hours": SUMMARY_CACHE_DURATION_HOURS,
+    "window_width": WINDOW_WIDTH,
+    "window_height": WINDOW_HEIGHT,
+    "min_window_width": MIN_WINDOW_WIDTH,
+    "min_window_height": MIN_WINDOW_HEIGHT,
+    "log_level": LOG_LEVEL,
+    "debug": DEBUG,
+    "reload": RELOAD,
+    "default_rss_sources": DEFAULT_RSS_SOURCES,
+    "supported_export_formats": SUPPORTED_EXPORT_FORMATS,
+    "default_export_format": DEFAULT_EXPORT_FORMAT,
+    "theme_colors": THEME_COLORS,
+    "rate_limit_requests_per_minute": RATE_LIMIT_REQUESTS_PER_MINUTE,
+    "rate_limit_burst": RATE_LIMIT_BURST
+})
+
 def get_config():
-    """Get configuration as dictionary."""
-    return {
-        "database_url": DATABASE_URL,
-        "api_host": API_HOST,
-        "api_port": API_PORT,
-        "api_base_url": API_BASE_URL,
-        "ws_url": WS_URL,
-        "default_limit": DEFAULT_LIMIT,
-        "max_limit": MAX_LIMIT,
-        "request_delay": REQUEST_DELAY,
-        "request_timeout": REQUEST_TIMEOUT,
-        "summary_strategies": SUMMARY_STRATEGIES,
-        "default_summary_strategy": DEFAULT_SUMMARY_STRATEGY,
-        "summary_cache_duration_hours": SUMMARY_CACHE_DURATION_HOURS,
-        "window_width": WINDOW_WIDTH,
-        "window_height": WINDOW_HEIGHT,
-        "min_window_width": MIN_WINDOW_WIDTH,
-        "min_window_height": MIN_WINDOW_HEIGHT,
-        "log_level": LOG_LEVEL,
-        "debug": DEBUG,
-        "reload": RELOAD,
-        "default_rss_sources": DEFAULT_RSS_SOURCES,
-        "supported_export_formats": SUPPORTED_EXPORT_FORMATS,
-        "default_export_format": DEFAULT_EXPORT_FORMAT,
-        "theme_colors": THEME_COLORS,
-        "rate_limit_requests_per_minute": RATE_LIMIT_REQUESTS_PER_MINUTE,
-        "rate_limit_burst": RATE_LIMIT_BURST
-    }
+    """Get configuration as a read-only mapping."""
+    return _CONFIG
 
 def load_user_config():
     """Load user configuration from file."""
     if CONFIG_FILE.exists():
-        import json
+        import orjson
         try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return orjson.loads(CONFIG_FILE.read_bytes())
         except Exception as e:
             print(f"Error loading user config: {e}")
             return {}
@@ -163,10 +166,10 @@ def load_user_config():
 
 def save_user_config(config):
     """Save user configuration to file."""
-    import json
+    import orjson
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        # orjson always writes UTF-8, matching the old ensure_ascii=False output
+        CONFIG_FILE.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
         return True
     except Exception as e:
         print(f"Error saving user config: {e}")
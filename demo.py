@@ -101,6 +101,8 @@ async def demo_crawler():
         print("❌ Crawling failed")
         print(f"   Error: {task.error_message}")
     
+    await crawler_service.close()
+    
     print(f"\n🎉 Demo completed!")
     print(f"\n💡 Next steps:")
     print(f"   1. Start the desktop app: python start_all.py")
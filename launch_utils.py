@@ -0,0 +1,20 @@
+"""
+Helpers shared by the launcher scripts.
+"""
+
+import sys
+import hashlib
+import subprocess
+
+def install_backend_dependencies(backend_dir):
+    """Run pip only when requirements.txt or the interpreter has changed."""
+    requirements = backend_dir / "requirements.txt"
+    digest = hashlib.sha1(requirements.read_bytes() + sys.executable.encode()).hexdigest()
+    sentinel = backend_dir / f".deps.{digest}"
+    if sentinel.exists():
+        return
+    
+    print("Installing backend dependencies...")
+    result = subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], cwd=backend_dir)
+    if result.returncode == 0:
+        sentinel.touch()
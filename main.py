@@ -6,23 +6,23 @@ Aggregates news articles from RSS feeds based on keywords and outputs to JSONL/C
 
 import argparse
 import asyncio
-import json
+import csv
+import hashlib
+import itertools
 import logging
 import re
 import time
+import weakref
 from datetime import datetime, timezone
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional, Set
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
 
-import dateparser
 import feedparser
 import httpx
-import pandas as pd
-import trafilatura
-from bs4 import BeautifulSoup
-from readability import Document
-from tqdm import tqdm
+import orjson
+from tqdm.asyncio import tqdm
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +31,80 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+    logger.warning("selectolax not available. Using BeautifulSoup for text extraction.")
+
+# Feeds fetched within this many seconds are served from the disk cache
+FEED_CACHE_TTL = 900
+
+# Map common feed domains to readable source names
+_SOURCE_MAP = MappingProxyType({
+    'www.bing.com': 'Bing News',
+    'news.google.com': 'Google News',
+    'feeds.a.dj.com': 'Wall Street Journal',
+    'www.reuters.com': 'Reuters',
+    'www.nasdaq.com': 'Nasdaq'
+})
+
+# Query parameters that only track the click and never change the article
+TRACKING_PARAMS = frozenset({'fbclid', 'gclid', 'ref'})
+
+# Advertise Brotli only when httpx can decode it (httpx[brotli])
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Sent with feed requests only; article pages are fetched with the default Accept
+FEED_ACCEPT = 'application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8'
+
+# One HTTP client per event loop so connection pools and TLS sessions survive
+# across NewsCrawler instances; a client's connections belong to the loop that
+# opened them. Closed by close_shared_client() at exit.
+_SHARED_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the running loop's HTTP/2 client, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _SHARED_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _SHARED_CLIENTS[loop] = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=50,
+                max_connections=100,
+                keepalive_expiry=30.0
+            ),
+            follow_redirects=True,
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+                'Accept-Encoding': ACCEPT_ENCODING
+            }
+        )
+    return client
+
+
+async def close_shared_client():
+    """Close the running loop's HTTP client."""
+    client = _SHARED_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+# Text cleanup patterns, compiled once
+_WS_RE = re.compile(r'\s+')
+_NOISE_RE = re.compile(r'Advertisement|Subscribe|Newsletter', re.IGNORECASE)
+# A terminator only ends a sentence before whitespace, so "3.5%" stays whole;
+# matching terminators alone keeps the scan linear on text without any
+_SENTENCE_END_RE = re.compile(r'[.!?](?=\s|$)')
+
 
 class NewsCrawler:
     """Main news crawler class."""
@@ -44,26 +118,54 @@ class NewsCrawler:
         self.since = since
         self.limit = limit
         self.custom_feeds = custom_feeds
+        self._since_dt = self.parse_since(since)
+
+        # Relevance matcher compiled once; search() stops at the first hit
+        self._query_words = self.query.lower().split()
+        self._relevance_re = re.compile(
+            r'\b(?:' + '|'.join(map(re.escape, self._query_words)) + r')\b',
+            re.IGNORECASE
+        ) if self._query_words else None
         self.seen_urls: Set[str] = set()
         self.articles: List[Dict] = []
+        self.content_concurrency = 10  # article bodies fetched at once
+        self._feed_cache_dir = Path(__file__).parent / ".cache" / "feeds"
+        self._feed_source_cache: Dict[str, str] = {}
 
-        # Rate limiting
-        self.request_delay = 1.0  # seconds between requests
-        self.last_request_time = 0
+        # Per-host rate limiting; different hosts are fetched in parallel
+        self.request_delay = 1.0  # seconds between requests to the same host
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._host_last: Dict[str, float] = {}
 
-        # HTTP client with timeout
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-        )
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP/2 client with keep-alive pooling; feeds share a handful of hosts."""
+        return get_shared_client()
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        # The shared client outlives this crawler; see close_shared_client()
+        pass
+
+    @staticmethod
+    def parse_since(since: Optional[str]) -> Optional[datetime]:
+        """Parse the --since value once, as an aware UTC datetime."""
+        if not since:
+            return None
+
+        # dateparser is slow to import and to parse; only needed with --since
+        import dateparser
+        since_date = dateparser.parse(since)
+        if since_date is None:
+            logger.warning(f"Could not parse since date: {since}")
+            return None
+
+        # Naive dates are taken as UTC, like the feed timestamps
+        if since_date.tzinfo is None:
+            return since_date.replace(tzinfo=timezone.utc)
+        return since_date.astimezone(timezone.utc)
 
     def load_default_feeds(self) -> List[str]:
         """Load default RSS feeds from config file."""
@@ -102,26 +204,49 @@ class NewsCrawler:
         # Prioritize query-specific feeds
         return query_feeds + general_feeds
 
-    async def rate_limit(self):
-        """Implement rate limiting between requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    async def _host_gate(self, url: str):
+        """Space out requests to the same host by request_delay."""
+        host = urlparse(url).netloc
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
 
-        if time_since_last < self.request_delay:
-            await asyncio.sleep(self.request_delay - time_since_last)
+        async with lock:
+            wait = self.request_delay - (time.monotonic() - self._host_last.get(host, 0))
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._host_last[host] = time.monotonic()
 
-        self.last_request_time = time.time()
-
-    async def fetch_rss_feed(self, feed_url: str) -> List[Dict]:
-        """Fetch and parse RSS feed."""
+    async def fetch_rss_feed(self, feed_url: str, max_articles: Optional[int] = None) -> List[Dict]:
+        """Fetch and parse RSS feed, keeping at most max_articles relevant entries."""
         try:
-            await self.rate_limit()
-
-            logger.info(f"Fetching RSS feed: {feed_url}")
-            response = await self.client.get(feed_url)
-            response.raise_for_status()
-
-            feed = feedparser.parse(response.text)
+            cached = self._load_feed_cache(feed_url)
+            if cached and time.time() - cached['fetched_at'] < FEED_CACHE_TTL:
+                logger.info(f"Using cached RSS feed: {feed_url}")
+                body = cached['body']
+            else:
+                await self._host_gate(feed_url)
+
+                # Conditional GET so unchanged feeds come back as an empty 304
+                headers = {'Accept': FEED_ACCEPT}
+                if cached and cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached and cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+
+                logger.info(f"Fetching RSS feed: {feed_url}")
+                response = await self.client.get(feed_url, headers=headers)
+                if cached and response.status_code == 304:
+                    body = cached['body']
+                    self._save_feed_cache(feed_url, body, cached.get('etag'), cached.get('last_modified'))
+                else:
+                    response.raise_for_status()
+                    body = response.text
+                    self._save_feed_cache(
+                        feed_url, body,
+                        response.headers.get('etag'), response.headers.get('last-modified')
+                    )
+
+            # feedparser is pure Python; parse off the event loop
+            feed = await asyncio.to_thread(feedparser.parse, body)
 
             if feed.bozo:
                 logger.warning(
@@ -129,12 +254,11 @@ class NewsCrawler:
 
             articles = []
             for entry in feed.entries:
-                if len(self.articles) >= self.limit:
-                    break
-
                 article = self.parse_rss_entry(entry, feed_url)
                 if article and self.is_relevant(article):
                     articles.append(article)
+                    if max_articles is not None and len(articles) >= max_articles:
+                        break
 
             return articles
 
@@ -142,6 +266,32 @@ class NewsCrawler:
             logger.error(f"Error fetching RSS feed {feed_url}: {e}")
             return []
 
+    def _feed_cache_path(self, feed_url: str) -> Path:
+        """Disk cache file for a feed URL."""
+        return self._feed_cache_dir / f"{hashlib.sha256(feed_url.encode()).hexdigest()}.json"
+
+    def _load_feed_cache(self, feed_url: str) -> Optional[Dict]:
+        """Load a cached feed body and its validators, if present."""
+        try:
+            return orjson.loads(self._feed_cache_path(feed_url).read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def _save_feed_cache(self, feed_url: str, body: str,
+                         etag: Optional[str], last_modified: Optional[str]):
+        """Store a feed body with its ETag/Last-Modified validators."""
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': body,
+            'fetched_at': time.time()
+        }
+        try:
+            self._feed_cache_dir.mkdir(parents=True, exist_ok=True)
+            self._feed_cache_path(feed_url).write_bytes(orjson.dumps(entry))
+        except OSError as e:
+            logger.warning(f"Could not cache RSS feed {feed_url}: {e}")
+
     def parse_rss_entry(self, entry, feed_url: str) -> Optional[Dict]:
         """Parse RSS entry into standardized article format."""
         try:
@@ -153,10 +303,11 @@ class NewsCrawler:
             if not title or not url:
                 return None
 
-            # Skip if already seen
-            if url in self.seen_urls:
+            # Skip if already seen under any tracking-parameter variant
+            key = self._canon(url)
+            if key in self.seen_urls:
                 return None
-            self.seen_urls.add(url)
+            self.seen_urls.add(key)
 
             # Parse published date
             published = None
@@ -168,10 +319,8 @@ class NewsCrawler:
                     *entry.updated_parsed[:6], tzinfo=timezone.utc)
 
             # Filter by date if specified
-            if self.since and published:
-                since_date = dateparser.parse(self.since)
-                if since_date and published.replace(tzinfo=None) < since_date:
-                    return None
+            if self._since_dt and published and published < self._since_dt:
+                return None
 
             # Extract source from feed URL or entry
             source = self.extract_source(feed_url, entry)
@@ -194,26 +343,29 @@ class NewsCrawler:
             logger.error(f"Error parsing RSS entry: {e}")
             return None
 
+    @staticmethod
+    def _canon(url: str) -> str:
+        """Canonical form of a URL for deduplication."""
+        parts = urlsplit(url)
+        query = urlencode([
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+        ])
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
+
     def extract_source(self, feed_url: str, entry) -> str:
         """Extract source name from feed URL or entry."""
         # Try to get source from entry first
         if hasattr(entry, 'source') and hasattr(entry.source, 'title'):
             return entry.source.title
 
-        # Extract from feed URL
-        parsed = urlparse(feed_url)
-        domain = parsed.netloc.lower()
-
-        # Map common domains to readable names
-        source_map = {
-            'www.bing.com': 'Bing News',
-            'news.google.com': 'Google News',
-            'feeds.a.dj.com': 'Wall Street Journal',
-            'www.reuters.com': 'Reuters',
-            'www.nasdaq.com': 'Nasdaq'
-        }
+        # Extract from feed URL, once per feed
+        source = self._feed_source_cache.get(feed_url)
+        if source is None:
+            domain = urlparse(feed_url).netloc.lower()
+            source = self._feed_source_cache[feed_url] = _SOURCE_MAP.get(domain, domain)
 
-        return source_map.get(domain, domain)
+        return source
 
     def extract_tags(self, entry) -> List[str]:
         """Extract tags from RSS entry."""
@@ -231,55 +383,63 @@ class NewsCrawler:
 
     def is_relevant(self, article: Dict) -> bool:
         """Check if article is relevant to the query."""
-        query_words = set(self.query.lower().split())
-
-        # Check title and summary
-        text_to_check = f"{article['title']} {article['summary']}".lower()
-        text_words = set(re.findall(r'\b\w+\b', text_to_check))
+        if self._relevance_re is None:
+            return False
 
         # Simple relevance check - at least one query word should be present
-        return bool(query_words.intersection(text_words))
+        return bool(self._relevance_re.search(article['title'])
+                    or self._relevance_re.search(article['summary']))
 
     async def fetch_article_content(self, article: Dict) -> str:
         """Fetch and extract article content."""
         try:
-            await self.rate_limit()
+            await self._host_gate(article['url'])
 
             logger.info(f"Fetching article content: {article['url']}")
             response = await self.client.get(article['url'])
             response.raise_for_status()
 
-            # Try trafilatura first
-            content = trafilatura.extract(response.text)
-            if content:
-                return self.clean_text(content)
-
-            # Fallback to readability
-            doc = Document(response.text)
-            content = doc.summary()
-            if content:
-                # Parse with BeautifulSoup to get text
-                soup = BeautifulSoup(content, 'html.parser')
-                return self.clean_text(soup.get_text())
-
-            return ""
+            return await asyncio.to_thread(self._extract_content, response.text)
 
         except Exception as e:
             logger.error(
                 f"Error fetching article content {article['url']}: {e}")
             return ""
 
+    def _extract_content(self, html: str) -> str:
+        """Extract article text from HTML; CPU-bound, run in a worker thread."""
+        # Imported here so --help and feed-only runs skip the heavy parsers
+        import trafilatura
+        from readability import Document
+
+        # Try trafilatura first
+        content = trafilatura.extract(html)
+        if content:
+            return self.clean_text(content)
+
+        # Fallback to readability
+        doc = Document(html)
+        content = doc.summary()
+        if content:
+            # Get text from the readability HTML; selectolax's C parser is much faster
+            if SELECTOLAX_AVAILABLE:
+                return self.clean_text(HTMLParser(content).body.text(separator=' '))
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(content, 'html.parser')
+            return self.clean_text(soup.get_text())
+
+        return ""
+
     def clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         if not text:
             return ""
 
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
 
         # Remove common noise
-        text = re.sub(r'Advertisement|Subscribe|Newsletter',
-                      '', text, flags=re.IGNORECASE)
+        text = _NOISE_RE.sub('', text)
 
         return text.strip()
 
@@ -294,12 +454,10 @@ class NewsCrawler:
         if not text:
             return ""
 
-        # Simple summary: first paragraph or first few sentences
-        sentences = text.split('. ')
-        if len(sentences) >= 2:
-            return sentences[0] + '. ' + sentences[1] + '.'
-        elif len(sentences) == 1:
-            return sentences[0] + '.'
+        # Simple summary: first two sentences, without splitting the whole text
+        ends = list(itertools.islice(_SENTENCE_END_RE.finditer(text), 2))
+        if ends:
+            return text[:ends[-1].end()].strip()
 
         return text[:200] + '...' if len(text) > 200 else text
 
@@ -316,8 +474,9 @@ class NewsCrawler:
         logger.info(
             f"Starting crawl with {len(query_feeds)} feeds, limit: {self.limit}")
 
-        # Fetch RSS feeds concurrently
-        tasks = [self.fetch_rss_feed(feed) for feed in query_feeds]
+        # Fetch RSS feeds concurrently, each capped to a share of the limit
+        per_feed_cap = max(5, (self.limit * 2) // max(1, len(query_feeds)))
+        tasks = [self.fetch_rss_feed(feed, per_feed_cap) for feed in query_feeds]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Collect articles
@@ -329,19 +488,24 @@ class NewsCrawler:
 
         logger.info(f"Found {len(self.articles)} articles from RSS feeds")
 
-        # Fetch article content
+        # Limit results before fetching any article bodies
+        self.articles = self.articles[:self.limit]
+
+        # Fetch article content with bounded concurrency
         if self.articles:
             logger.info("Fetching article content...")
-            for article in tqdm(self.articles, desc="Fetching content"):
-                if len(self.articles) > self.limit:
-                    break
+            semaphore = asyncio.Semaphore(self.content_concurrency)
 
-                content = await self.fetch_article_content(article)
-                article['text'] = content
+            async def fetch_one(article: Dict):
+                async with semaphore:
+                    article['text'] = await self.fetch_article_content(article)
                 article['summary'] = self.generate_summary(article)
 
-        # Limit final results
-        self.articles = self.articles[:self.limit]
+            await tqdm.gather(
+                *(fetch_one(article) for article in self.articles),
+                desc="Fetching content",
+                miniters=max(1, len(self.articles) // 20)  # redraw about every 5%
+            )
 
         logger.info(f"Crawling completed. Found {len(self.articles)} articles")
 
@@ -349,10 +513,12 @@ class NewsCrawler:
         """Save articles to JSONL format."""
         output_file = output_dir / "news.jsonl"
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for article in self.articles:
-                json.dump(article, f, ensure_ascii=False)
-                f.write('\n')
+        # One buffered write per block of records caps peak memory on large runs
+        block_size = 1024
+        with open(output_file, 'wb') as f:
+            for start in range(0, len(self.articles), block_size):
+                block = self.articles[start:start + block_size]
+                f.write(b''.join(orjson.dumps(article) + b'\n' for article in block))
 
         logger.info(f"Saved {len(self.articles)} articles to {output_file}")
 
@@ -363,10 +529,7 @@ class NewsCrawler:
 
         output_file = output_dir / "news.csv"
 
-        # Convert to DataFrame
-        df = pd.DataFrame(self.articles)
-
-        # Reorder columns
+        # Column order
         column_order = [
             'title',
             'source',
@@ -375,10 +538,12 @@ class NewsCrawler:
             'summary',
             'text',
             'tags']
-        df = df.reindex(columns=column_order)
 
-        # Save to CSV
-        df.to_csv(output_file, index=False, encoding='utf-8')
+        # Stream rows straight from the article dicts
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=column_order, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(self.articles)
 
         logger.info(f"Saved {len(self.articles)} articles to {output_file}")
 
@@ -408,15 +573,18 @@ async def main():
     output_dir.mkdir(exist_ok=True)
 
     # Run crawler
-    async with NewsCrawler(
-        query=args.q,
-        since=args.since,
-        limit=args.limit,
-        custom_feeds=custom_feeds
-    ) as crawler:
-        await crawler.crawl()
-        crawler.save_to_jsonl(output_dir)
-        crawler.save_to_csv(output_dir)
+    try:
+        async with NewsCrawler(
+            query=args.q,
+            since=args.since,
+            limit=args.limit,
+            custom_feeds=custom_feeds
+        ) as crawler:
+            await crawler.crawl()
+            crawler.save_to_jsonl(output_dir)
+            crawler.save_to_csv(output_dir)
+    finally:
+        await close_shared_client()
 
 
 if __name__ == "__main__":
@@ -7,25 +7,37 @@ Start script to run both backend and frontend services.
 import sys
 import os
 import subprocess
-import threading
 import time
 import signal
+import urllib.request
 from pathlib import Path
 
+from launch_utils import install_backend_dependencies
+
+BACKEND_HEALTH_URL = "http://localhost:8000/health"
+
+def wait_for_url(url, timeout=60.0, process=None):
+    """Poll url until it answers, the timeout passes or process exits."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
 def start_backend():
-    """Start the backend service."""
+    """Start the backend service and return its process."""
     backend_dir = Path(__file__).parent / "backend"
     
-    # Install dependencies if needed
-    try:
-        import fastapi
-        import uvicorn
-    except ImportError:
-        print("Installing backend dependencies...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], cwd=backend_dir)
+    # Install dependencies if requirements.txt changed since the last install
+    install_backend_dependencies(backend_dir)
     
     print("Starting backend service...")
-    subprocess.run([
+    return subprocess.Popen([
         sys.executable, "-m", "uvicorn", 
         "main:app", 
         "--host", "0.0.0.0", 
@@ -34,10 +46,7 @@ def start_backend():
     ], cwd=backend_dir)
 
 def start_vue_frontend():
-    """Start the Vue frontend application."""
-    # Wait a bit for backend to start
-    time.sleep(3)
-    
+    """Start the Vue frontend application and return its process."""
     frontend_dir = Path(__file__).parent / "frontend"
     
     # Install dependencies if needed
@@ -47,13 +56,10 @@ def start_vue_frontend():
     
     print("Starting Vue frontend application...")
     # 使用concurrently同时启动Vite和Electron
-    subprocess.run(["npm", "run", "electron:dev"], cwd=frontend_dir)
+    return subprocess.Popen(["npm", "run", "electron:dev"], cwd=frontend_dir)
 
 def start_original_frontend():
-    """Start the original frontend application."""
-    # Wait a bit for backend to start
-    time.sleep(3)
-    
+    """Start the original frontend application and return its process."""
     frontend_dir = Path(__file__).parent / "frontend"
     
     # Install dependencies if needed
@@ -62,7 +68,7 @@ def start_original_frontend():
         subprocess.run(["npm", "install"], cwd=frontend_dir)
     
     print("Starting original frontend application...")
-    subprocess.run(["npm", "start"], cwd=frontend_dir)
+    return subprocess.Popen(["npm", "start"], cwd=frontend_dir)
 
 def main():
     print("🚀 启动新闻爬虫桌面应用")
@@ -87,22 +93,29 @@ def main():
     
     print(f"📱 前端类型: {frontend_type.upper()}")
     
-    # Start backend in a separate thread
-    backend_thread = threading.Thread(target=start_backend, daemon=True)
-    backend_thread.start()
-    
-    # Wait a moment for backend to initialize
-    time.sleep(2)
+    backend_process = start_backend()
+    frontend_process = None
     
-    # Start frontend based on type
     try:
+        # Start the frontend as soon as the backend answers /health
+        if not wait_for_url(BACKEND_HEALTH_URL, process=backend_process):
+            if backend_process.poll() is not None:
+                print("❌ 后端启动失败")
+                sys.exit(1)
+            print("⚠️  后端尚未就绪，继续启动前端")
+        
+        # Start frontend based on type
         if frontend_type == "vue":
-            start_vue_frontend()
+            frontend_process = start_vue_frontend()
         else:
-            start_original_frontend()
+            frontend_process = start_original_frontend()
+        frontend_process.wait()
     except KeyboardInterrupt:
         print("\n🛑 正在关闭应用...")
-        sys.exit(0)
+    finally:
+        for process in (frontend_process, backend_process):
+            if process is not None and process.poll() is None:
+                process.terminate()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
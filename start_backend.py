@@ -8,17 +8,14 @@ import os
 import subprocess
 from pathlib import Path
 
+from launch_utils import install_backend_dependencies
+
 def main():
     # Get backend directory
     backend_dir = Path(__file__).parent / "backend"
     
-    # Install dependencies if needed
-    try:
-        import fastapi
-        import uvicorn
-    except ImportError:
-        print("Installing backend dependencies...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], cwd=backend_dir)
+    # Install dependencies if requirements.txt changed since the last install
+    install_backend_dependencies(backend_dir)
     
     # Start the backend service
     print("Starting News Crawler backend service...")
@@ -26,14 +23,20 @@ def main():
     print("WebSocket will be available at: ws://localhost:8000/ws")
     print("Press Ctrl+C to stop the service")
     
-    # Start the full backend service
-    subprocess.run([
+    # Start the full backend service, replacing this launcher process
+    command = [
         sys.executable, "-m", "uvicorn", 
         "main:app", 
         "--host", "0.0.0.0", 
         "--port", "8000", 
         "--reload"
-    ], cwd=backend_dir)
+    ]
+    if os.name == 'nt':
+        # exec on Windows spawns a detached child instead of replacing us
+        subprocess.run(command, cwd=backend_dir)
+    else:
+        os.chdir(backend_dir)
+        os.execvp(command[0], command)
 
 if __name__ == "__main__":
     main()
@@ -7,13 +7,26 @@ import subprocess
 import sys
 import os
 import time
-import threading
+import urllib.request
 import webbrowser
 
+def wait_for_url(url, timeout=60.0, process=None):
+    """轮询url直到可访问、超时或进程退出"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
 def start_backend():
     """启动后端服务"""
     backend_dir = os.path.join(os.path.dirname(__file__), 'backend')
-    subprocess.run([
+    return subprocess.Popen([
         sys.executable, "-m", "uvicorn", 
         "main:app", 
         "--host", "0.0.0.0", 
@@ -24,7 +37,7 @@ def start_backend():
 def start_vue_dev():
     """启动Vue开发服务器"""
     frontend_dir = os.path.join(os.path.dirname(__file__), 'frontend')
-    subprocess.run(["npm", "run", "dev"], cwd=frontend_dir)
+    return subprocess.Popen(["npm", "run", "dev"], cwd=frontend_dir)
 
 def main():
     print("🚀 启动新闻爬虫桌面应用")
@@ -32,19 +45,19 @@ def main():
     
     # 启动后端
     print("📡 启动后端服务...")
-    backend_thread = threading.Thread(target=start_backend, daemon=True)
-    backend_thread.start()
+    backend_process = start_backend()
     
-    # 等待后端启动
-    time.sleep(3)
+    # 等待后端就绪
+    if not wait_for_url('http://localhost:8000/health', process=backend_process):
+        print("⚠️  后端尚未就绪")
     
     # 启动Vue开发服务器
     print("🌐 启动Vue开发服务器...")
-    vue_thread = threading.Thread(target=start_vue_dev, daemon=True)
-    vue_thread.start()
+    vue_process = start_vue_dev()
     
-    # 等待Vue服务器启动
-    time.sleep(5)
+    # 等待Vue服务器就绪
+    if not wait_for_url('http://localhost:5173', process=vue_process):
+        print("⚠️  Vue开发服务器尚未就绪")
     
     print("✅ 服务启动完成!")
     print("📱 应用地址: http://localhost:5173")
@@ -59,12 +72,15 @@ def main():
         print("⚠️  请手动打开浏览器访问: http://localhost:5173")
     
     try:
-        # 保持运行
-        while True:
+        # 保持运行，直到任一服务退出
+        while backend_process.poll() is None and vue_process.poll() is None:
             time.sleep(1)
     except KeyboardInterrupt:
         print("\n🛑 正在关闭应用...")
-        sys.exit(0)
+    finally:
+        for process in (vue_process, backend_process):
+            if process.poll() is None:
+                process.terminate()
 
 if __name__ == '__main__':
     main()
@@ -21,7 +21,13 @@ def main():
     print("Starting News Crawler desktop application...")
     print("Make sure the backend service is running on http://localhost:8000")
     
-    subprocess.run(["npm", "start"], cwd=frontend_dir)
+    # Replace this launcher process with npm
+    if os.name == 'nt':
+        # exec on Windows spawns a detached child instead of replacing us
+        subprocess.run(["npm", "start"], cwd=frontend_dir)
+    else:
+        os.chdir(frontend_dir)
+        os.execvp("npm", ["npm", "start"])
 
 if __name__ == "__main__":
     main()
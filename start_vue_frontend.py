@@ -3,99 +3,273 @@
 启动Vue版本的前端应用
 """
 
+import asyncio
+import hashlib
+import re
+import shutil
 import subprocess
 import sys
 import os
-import time
 import signal
-import threading
 
-def run_command(cmd, cwd=None):
-    """运行命令并返回进程"""
-    return subprocess.Popen(
-        cmd,
-        shell=True,
+# Vite的启动横幅，出现即表示开发服务器已就绪
+VITE_READY_MARKERS = ("ready in", "Local:")
+ANSI_ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*m')
+VITE_PORT = 5173
+
+# 直接执行npm而不经过shell；Windows上解析为npm.cmd
+NPM = shutil.which('npm') or ('npm.cmd' if os.name == 'nt' else 'npm')
+
+# Node.js检查通过的标记，比node/npm可执行文件新时跳过检查
+NODE_OK_MARKER = os.path.expanduser('~/.cache/news-crawler/node-ok')
+
+# 事件循环只保留任务的弱引用，后台转发任务需在此持有
+background_tasks = set()
+
+async def run_command(argv, cwd=None, capture=False, env=None):
+    """运行命令并返回进程；capture=True时合并输出到管道，调用方必须持续读取"""
+    return await asyncio.create_subprocess_exec(
+        *argv,
         cwd=cwd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        preexec_fn=None if os.name == 'nt' else os.setsid
+        env=env,
+        stdout=subprocess.PIPE if capture else None,
+        stderr=subprocess.STDOUT if capture else None,
+        start_new_session=os.name != 'nt'
     )
 
-def main():
+async def relay_output(stream, ready=None):
+    """把子进程输出转发到终端，看到Vite就绪横幅时设置ready"""
+    while line := await stream.readline():
+        sys.stdout.buffer.write(line)
+        sys.stdout.flush()
+        if ready is not None and not ready.is_set():
+            text = ANSI_ESCAPE_RE.sub('', line.decode(errors='replace'))
+            if any(marker in text for marker in VITE_READY_MARKERS):
+                ready.set()
+
+async def probe_port(port, ready, interval=0.1):
+    """端口可连接时设置ready，作为横幅检测的补充"""
+    while not ready.is_set():
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            ready.set()
+        except OSError:
+            await asyncio.sleep(interval)
+
+async def wait_for_vite(vue_process, timeout=30.0):
+    """等待Vite就绪；进程退出返回False，超时返回None"""
+    ready = asyncio.Event()
+    relay = asyncio.create_task(relay_output(vue_process.stdout, ready))
+    background_tasks.add(relay)
+    relay.add_done_callback(background_tasks.discard)
+    probe = asyncio.create_task(probe_port(VITE_PORT, ready))
+    ready_waiter = asyncio.create_task(ready.wait())
+    exit_waiter = asyncio.create_task(vue_process.wait())
+
+    try:
+        done, _ = await asyncio.wait({ready_waiter, exit_waiter}, timeout=timeout,
+                                     return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in (probe, ready_waiter, exit_waiter):
+            task.cancel()
+
+    if ready_waiter in done:
+        return True
+    return False if exit_waiter in done else None
+
+async def check_node():
+    """并行检查node和npm是否可用，结果缓存到标记文件"""
+    binaries = [shutil.which('node'), shutil.which('npm')]
+    if not all(binaries):
+        return False
+
+    try:
+        if os.path.getmtime(NODE_OK_MARKER) > max(map(os.path.getmtime, binaries)):
+            return True
+    except OSError:
+        pass
+
+    try:
+        processes = await asyncio.gather(*(
+            asyncio.create_subprocess_exec(
+                binary, '--version',
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            for binary in binaries
+        ))
+    except OSError:
+        return False
+    if any(await asyncio.gather(*(process.wait() for process in processes))):
+        return False
+
+    os.makedirs(os.path.dirname(NODE_OK_MARKER), exist_ok=True)
+    with open(NODE_OK_MARKER, 'a'):
+        os.utime(NODE_OK_MARKER)
+    return True
+
+async def install_dependencies(frontend_dir):
+    """package-lock.json变化时用npm ci重新安装依赖"""
+    lockfile = os.path.join(frontend_dir, 'package-lock.json')
+    node_modules = os.path.join(frontend_dir, 'node_modules')
+    hash_file = os.path.join(node_modules, '.install-hash')
+
+    env = None
+    digest = None
+    if os.path.exists(lockfile):
+        with open(lockfile, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        try:
+            with open(hash_file, encoding='utf-8') as f:
+                if f.read().strip() == digest:
+                    return True
+        except OSError:
+            pass
+        # 持久化npm缓存，离线优先
+        env = {
+            **os.environ,
+            'NPM_CONFIG_CACHE': os.path.expanduser('~/.cache/news-crawler-npm'),
+            'CI': '1'
+        }
+        argv = [NPM, 'ci', '--prefer-offline', '--no-audit', '--no-fund', '--silent']
+    elif os.path.exists(node_modules):
+        return True
+    else:
+        argv = [NPM, 'install']
+
+    print("📦 安装依赖...")
+    install_process = await run_command(argv, cwd=frontend_dir, env=env)
+    try:
+        await install_process.wait()
+    except asyncio.CancelledError:
+        await shutdown((install_process,))
+        raise
+    if install_process.returncode != 0:
+        return False
+
+    if digest:
+        with open(hash_file, 'w', encoding='utf-8') as f:
+            f.write(digest)
+    print("✅ 依赖安装完成")
+    return True
+
+def exit_reason(returncode):
+    """把asyncio返回码转成可读描述，负值表示被信号终止"""
+    if returncode < 0:
+        try:
+            return f"被信号 {signal.Signals(-returncode).name} 终止"
+        except ValueError:
+            pass
+    return f"退出码 {returncode}"
+
+async def shutdown(processes, timeout=5.0):
+    """终止子进程组，超时后强制结束"""
+    for process in processes:
+        if process.returncode is None:
+            try:
+                if os.name == 'nt':
+                    process.terminate()
+                else:
+                    os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    for process in processes:
+        try:
+            await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            try:
+                if os.name == 'nt':
+                    process.kill()
+                else:
+                    os.killpg(os.getpgid(process.pid), signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+async def main():
     print("🚀 启动Vue版本的前端应用...")
-    
+
     # 检查是否在正确的目录
     if not os.path.exists('frontend/package.json'):
         print("❌ 错误: 请在项目根目录运行此脚本")
         sys.exit(1)
-    
+
     # 检查Node.js是否安装
-    try:
-        subprocess.run(['node', '--version'], check=True, capture_output=True)
-        subprocess.run(['npm', '--version'], check=True, capture_output=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    if not await check_node():
         print("❌ 错误: 请先安装Node.js和npm")
         sys.exit(1)
-    
+
     # 进入frontend目录
     frontend_dir = os.path.join(os.getcwd(), 'frontend')
-    
-    # 检查依赖是否安装
-    if not os.path.exists(os.path.join(frontend_dir, 'node_modules')):
-        print("📦 安装依赖...")
-        install_process = run_command('npm install', cwd=frontend_dir)
-        install_process.wait()
-        if install_process.returncode != 0:
-            print("❌ 依赖安装失败")
-            sys.exit(1)
-        print("✅ 依赖安装完成")
-    
-    # 启动Vue开发服务器
-    print("🌐 启动Vue开发服务器...")
-    vue_process = run_command('npm run dev', cwd=frontend_dir)
-    
-    # 等待Vue服务器启动
-    time.sleep(3)
-    
-    # 启动Electron
-    print("🖥️  启动Electron应用...")
-    electron_process = run_command('npm run electron', cwd=frontend_dir)
-    
-    def cleanup():
-        print("\n🛑 正在关闭应用...")
+
+    # 信号处理器只取消主任务，清理统一在下面的finally中完成；
+    # 子进程各自在独立会话中，收不到终端的Ctrl+C
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+    stopping = False
+
+    def request_stop():
+        nonlocal stopping
+        if not stopping:
+            stopping = True
+            main_task.cancel()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
         try:
-            if os.name == 'nt':
-                vue_process.terminate()
-                electron_process.terminate()
-            else:
-                os.killpg(os.getpgid(vue_process.pid), signal.SIGTERM)
-                os.killpg(os.getpgid(electron_process.pid), signal.SIGTERM)
-        except:
-            pass
-    
-    # 注册信号处理器
-    signal.signal(signal.SIGINT, lambda s, f: cleanup())
-    signal.signal(signal.SIGTERM, lambda s, f: cleanup())
-    
+            loop.add_signal_handler(sig, request_stop)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C 以 KeyboardInterrupt 形式到达
+
+    processes = []
     try:
+        # 检查依赖是否安装且与锁文件一致
+        if not await install_dependencies(frontend_dir):
+            print("❌ 依赖安装失败")
+            sys.exit(1)
+
+        # 启动Vue开发服务器
+        print("🌐 启动Vue开发服务器...")
+        vue_process = await run_command([NPM, 'run', 'dev'], cwd=frontend_dir, capture=True)
+        processes.append(vue_process)
+
+        # 等待Vue服务器就绪
+        vite_ready = await wait_for_vite(vue_process)
+        if vite_ready is False:
+            print(f"❌ Vue开发服务器已停止（{exit_reason(vue_process.returncode)}）")
+            return
+        if vite_ready is None:
+            print("⚠️  Vue开发服务器30秒内未就绪，继续启动Electron")
+
+        # 启动Electron
+        print("🖥️  启动Electron应用...")
+        electron_process = await run_command([NPM, 'run', 'electron'], cwd=frontend_dir)
+        processes.append(electron_process)
+
         print("✅ 应用已启动!")
         print("📱 如果Electron窗口没有自动打开，请手动访问: http://localhost:5173")
         print("⏹️  按 Ctrl+C 停止应用")
-        
-        # 等待进程结束
-        while True:
-            if vue_process.poll() is not None:
-                print("❌ Vue开发服务器已停止")
-                break
-            if electron_process.poll() is not None:
-                print("❌ Electron应用已停止")
-                break
-            time.sleep(1)
-            
-    except KeyboardInterrupt:
-        cleanup()
-    
+
+        # 等待任一进程结束，停止信号会取消这里的等待
+        waiters = {
+            asyncio.create_task(vue_process.wait()): "❌ Vue开发服务器已停止",
+            asyncio.create_task(electron_process.wait()): "❌ Electron应用已停止",
+        }
+        done, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        task = done.pop()
+        print(f"{waiters[task]}（{exit_reason(task.result())}）")
+    except asyncio.CancelledError:
+        if not stopping:
+            raise
+        print("\n🛑 正在关闭应用...")
+    finally:
+        await shutdown(processes)
+
     print("👋 应用已关闭")
 
 if __name__ == '__main__':
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("👋 应用已关闭")
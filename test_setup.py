@@ -5,22 +5,77 @@ Test script to verify News Crawler setup
 
 import sys
 import asyncio
-import requests
+import functools
+import importlib
 import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
+
+API_BASE_URL = "http://localhost:8000"
+
+# Put backend/ ahead of the project root so `main` resolves to the backend app
+_BACKEND = str(Path(__file__).resolve().parent / "backend")
+if _BACKEND not in sys.path:
+    sys.path.insert(0, _BACKEND)
+
+# One HTTP client shared by every API check; closed once the network checks finish
+_client = None
+
+@dataclass
+class CheckResult:
+    """Outcome of one setup check; ok is None when the check was skipped."""
+    name: str
+    ok: Optional[bool]
+
+def get_client():
+    """Return the shared API client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = get_module("httpx").AsyncClient(base_url=API_BASE_URL, timeout=5.0)
+    return _client
+
+async def close_client():
+    """Close the shared API client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+BACKEND_MODULES = ('fastapi', 'uvicorn', 'sqlalchemy', 'httpx', 'feedparser', 'trafilatura', 'pandas')
+
+# Modules imported by the dependency check, shared with the later checks
+MODULES = {}
+
+def get_module(name):
+    """Import a module on first use and hand the same object to every check."""
+    if name not in MODULES:
+        MODULES[name] = importlib.import_module(name)
+    return MODULES[name]
+
+@functools.lru_cache(maxsize=None)
+def load_backend():
+    """Import the backend app once and return its database module."""
+    database = get_module("database")
+    get_module("main").app
+    return database
+
+async def port_open(host="127.0.0.1", port=8000, timeout=0.2):
+    """Cheap TCP connect so a stopped backend is detected in milliseconds."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
 
 def test_backend_dependencies():
     """Test if backend dependencies are installed."""
     print("🔍 Testing backend dependencies...")
     
     try:
-        import fastapi
-        import uvicorn
-        import sqlalchemy
-        import httpx
-        import feedparser
-        import trafilatura
-        import pandas
+        for name in BACKEND_MODULES:
+            get_module(name)
         print("✓ All backend dependencies are installed")
         return True
     except ImportError as e:
@@ -47,50 +102,71 @@ def test_backend_startup():
     
     try:
         # Import backend modules
-        sys.path.append(str(Path(__file__).parent / "backend"))
-        from database import init_database
-        from main import app
+        database = load_backend()
         
         # Initialize database
-        init_database()
+        database.init_database()
         print("✓ Backend modules can be imported and database initialized")
         return True
     except Exception as e:
         print(f"❌ Backend startup failed: {e}")
         return False
 
-def test_api_connection():
+async def test_api_connection():
     """Test if API is accessible."""
     print("🔍 Testing API connection...")
     
     try:
-        response = requests.get("http://localhost:8000/health", timeout=5)
+        httpx = get_module("httpx")
+    except ImportError:
+        print("❌ httpx is not installed, cannot test the API")
+        return False
+    
+    if not await port_open():
+        print("❌ API is not running. Start it with: python start_backend.py")
+        return False
+    
+    try:
+        response = await get_client().get("/health")
         if response.status_code == 200:
             print("✓ API is accessible")
             return True
         else:
             print(f"❌ API returned status {response.status_code}")
             return False
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("❌ API is not running. Start it with: python start_backend.py")
         return False
     except Exception as e:
         print(f"❌ API connection failed: {e}")
         return False
 
-def test_websocket_connection():
+async def test_websocket_connection():
     """Test if WebSocket is accessible."""
     print("🔍 Testing WebSocket connection...")
     
     try:
-        import websocket
-        ws = websocket.create_connection("ws://localhost:8000/ws", timeout=5)
-        ws.close()
-        print("✓ WebSocket is accessible")
-        return True
+        websockets = get_module("websockets")
     except ImportError:
         print("⚠️  WebSocket library not installed, skipping test")
         return True
+    
+    if not await port_open():
+        print("❌ WebSocket connection failed: API is not running")
+        return False
+    
+    try:
+        # Only the handshake matters; close as soon as the upgrade succeeds
+        async def probe():
+            async with websockets.connect("ws://localhost:8000/ws", open_timeout=2, close_timeout=0.1):
+                pass
+        
+        await asyncio.wait_for(probe(), timeout=3)
+        print("✓ WebSocket is accessible")
+        return True
+    except (OSError, websockets.InvalidHandshake, asyncio.TimeoutError) as e:
+        print(f"❌ WebSocket connection failed: {str(e) or 'timed out'}")
+        return False
     except Exception as e:
         print(f"❌ WebSocket connection failed: {e}")
         return False
@@ -100,17 +176,19 @@ def test_database_operations():
     print("🔍 Testing database operations...")
     
     try:
-        sys.path.append(str(Path(__file__).parent / "backend"))
-        from database import get_db, CrawlTask, Article, RSSSource
-        from sqlalchemy.orm import Session
-        
-        # Get database session
-        db = next(get_db())
+        database = load_backend()
+        sqlalchemy = get_module("sqlalchemy")
+        func, select = sqlalchemy.func, sqlalchemy.select
         
-        # Test basic queries
-        task_count = db.query(CrawlTask).count()
-        article_count = db.query(Article).count()
-        source_count = db.query(RSSSource).count()
+        # Count all three tables in one round-trip
+        db = database.SessionLocal()
+        try:
+            task_count, article_count, source_count = db.execute(select(
+                *(select(func.count()).select_from(model).scalar_subquery()
+                  for model in (database.CrawlTask, database.Article, database.RSSSource))
+            )).one()
+        finally:
+            db.close()
         
         print(f"✓ Database operations working (Tasks: {task_count}, Articles: {article_count}, Sources: {source_count})")
         return True
@@ -127,34 +205,64 @@ def main():
         ("Frontend Dependencies", test_frontend_dependencies),
         ("Backend Startup", test_backend_startup),
         ("Database Operations", test_database_operations),
+    ]
+    
+    # Network checks only wait on timeouts, so they run concurrently
+    network_tests = [
         ("API Connection", test_api_connection),
         ("WebSocket Connection", test_websocket_connection),
     ]
     
-    results = []
+    # These need the backend importable; skip them when dependencies are missing
+    needs_backend = {"Backend Startup", "Database Operations"}
+    
+    passed = 0
+    total = len(tests) + len(network_tests)
+    backend_ready = False
+    
+    def report(result: CheckResult):
+        """Print one result line as soon as the check finishes."""
+        nonlocal passed
+        status = "⏭️  SKIP" if result.ok is None else "✓ PASS" if result.ok else "❌ FAIL"
+        print(f"  → {result.name}: {status}")
+        passed += result.ok is True
     
     for test_name, test_func in tests:
         print(f"\n{test_name}:")
+        if test_name in needs_backend and not backend_ready:
+            print("⏭️  Skipped: backend dependencies are missing")
+            report(CheckResult(test_name, None))
+            continue
         try:
-            result = test_func()
-            results.append((test_name, result))
+            result = CheckResult(test_name, test_func())
         except Exception as e:
             print(f"❌ Test failed with exception: {e}")
-            results.append((test_name, False))
+            result = CheckResult(test_name, False)
+        if test_name == "Backend Dependencies":
+            backend_ready = result.ok
+        report(result)
     
-    # Summary
-    print("\n" + "=" * 40)
-    print("📊 Test Results Summary:")
+    async def run_check(test_name, test_func):
+        try:
+            return CheckResult(test_name, await test_func())
+        except Exception as e:
+            print(f"❌ Test failed with exception: {e}")
+            return CheckResult(test_name, False)
     
-    passed = 0
-    total = len(results)
+    async def run_network_tests():
+        try:
+            for next_result in asyncio.as_completed(
+                [run_check(test_name, test_func) for test_name, test_func in network_tests]
+            ):
+                report(await next_result)
+        finally:
+            await close_client()
     
-    for test_name, result in results:
-        status = "✓ PASS" if result else "❌ FAIL"
-        print(f"  {test_name}: {status}")
-        if result:
-            passed += 1
+    print(f"\n{' / '.join(name for name, _ in network_tests)}:")
+    asyncio.run(run_network_tests())
     
+    # Summary
+    print("\n" + "=" * 40)
     print(f"\nOverall: {passed}/{total} tests passed")
     
     if passed == total: